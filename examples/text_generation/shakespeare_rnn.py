@@ -0,0 +1,97 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+
+import numpy as np
+import tensorflow_datasets as tfds
+
+import objax
+from objax.functional import one_hot
+from objax.functional.loss import cross_entropy_logits_sparse
+from objax.zoo.rnn import RNN
+
+# Data
+DATA_DIR = os.path.join(os.environ['HOME'], 'TFDS')
+data = tfds.as_numpy(tfds.load(name='tiny_shakespeare', batch_size=-1, data_dir=DATA_DIR))
+text = data['train']['text'][0].decode()
+vocab = sorted(set(text))
+char_to_id = {c: i for i, c in enumerate(vocab)}
+corpus = np.array([char_to_id[c] for c in text], dtype=np.int32)
+del data
+
+# Settings
+lr = 0.001
+batch = 64
+num_steps = 100
+nstate = 256
+num_train_epochs = 10
+
+# Model
+model = RNN(nstate, len(vocab), len(vocab))
+opt = objax.optimizer.Adam(model.vars())
+
+
+# Losses
+def loss(x, label):
+    logits = model(one_hot(x, len(vocab)))
+    return cross_entropy_logits_sparse(logits, label.reshape(-1)).mean()
+
+
+gv = objax.GradValues(loss, model.vars())
+
+
+def train_op(x, y):
+    g, v = gv(x, y)
+    opt(lr=lr, grads=g)
+    return v
+
+
+# The scan over time is compiled once for the (num_steps, batch) input shape and reused at every iteration.
+train_op = objax.Jit(train_op, gv.vars() + opt.vars())
+predict_op = objax.Jit(lambda x: objax.functional.softmax(model(one_hot(x, len(vocab)), only_return_final=True)),
+                       model.vars())
+
+
+def batches():
+    """Yields time-major (num_steps, batch) blocks of consecutive characters and their next characters."""
+    for _ in range(len(corpus) // (batch * num_steps)):
+        starts = np.random.randint(0, len(corpus) - num_steps - 1, size=batch)
+        seq = corpus[starts[:, None] + np.arange(num_steps + 1)].T
+        yield seq[:-1], seq[1:]
+
+
+def generate(prefix, length):
+    model.init_state(1)
+    x = np.array([char_to_id[c] for c in prefix])[:, None]
+    output = prefix
+    for _ in range(length):
+        output += vocab[int(predict_op(x)[0].argmax())]
+        x = np.array([[char_to_id[output[-1]]]])
+    return output
+
+
+# Training
+print(model.vars())
+for epoch in range(num_train_epochs):
+    losses = []
+    start = time.time()
+    for x, y in batches():
+        model.init_state(batch)
+        losses.append(train_op(x, y)[0])
+    # Dispatch is asynchronous, wait for the last step to finish before stopping the clock.
+    losses[-1].block_until_ready()
+    print('Epoch %04d  Loss %.2f  Time %.1fs' % (epoch + 1, np.mean(losses), time.time() - start))
+    print(generate('ROMEO:', 100))
@@ -186,7 +186,8 @@ class Jit(Module):
     def __init__(self,
                  f: Union[Module, Callable],
                  vc: Optional[VarCollection] = None,
-                 static_argnums: Optional[Tuple[int, ...]] = None):
+                 static_argnums: Optional[Tuple[int, ...]] = None,
+                 donate_argnums: Optional[Tuple[int, ...]] = None):
         """Jit constructor.
 
         Args:
@@ -194,6 +195,9 @@ class Jit(Module):
             vc: the VarCollection of variables used by the function or module. This argument is required for functions.
             static_argnums: tuple of indexes of f's input arguments to treat as static (constants)).
                 A new graph is compiled for each different combination of values for such inputs.
+            donate_argnums: tuple of indexes of f's input arguments whose buffers may be reused for the outputs,
+                which lowers peak memory. Donated arrays must not be used after the call. Only explicit arguments
+                can be donated: the variables of the VarCollection, such as a module's StateVar, are never donated.
         """
         if not isinstance(f, Module):
             if vc is None:
@@ -209,7 +213,9 @@ class Jit(Module):
                 self.vc.assign(original_values)
 
         self.vc = vc or f.vars()
-        self._call = jax.jit(jit, static_argnums=tuple(x + 2 for x in sorted(static_argnums or ())))
+        self._call = jax.jit(jit,
+                             static_argnums=tuple(x + 2 for x in sorted(static_argnums or ())),
+                             donate_argnums=tuple(x + 2 for x in sorted(donate_argnums or ())))
         self.__wrapped__ = f
 
     def __call__(self, *args, **kwargs):
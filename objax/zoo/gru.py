@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Callable
+from typing import Callable, Optional, Tuple
 
 import jax.numpy as jn
+from jax import lax
 
 from objax import Module
 from objax.nn.init import kaiming_normal
@@ -30,7 +31,9 @@ class GRU(Module):
                  nstate: int,
                  nin: int,
                  nout: int,
-                 w_init: Callable = kaiming_normal):
+                 w_init: Callable = kaiming_normal,
+                 unroll: int = 1,
+                 compute_dtype: Optional[jn.dtype] = None):
         """Creates a GRU instance.
 
         Args:
@@ -38,10 +41,17 @@ class GRU(Module):
             nin: number of input units.
             nout: number of output units.
             w_init: weight initializer for GRU model weights.
+            unroll: number of time steps unrolled in each iteration of the underlying loop. Larger values let XLA
+                fuse operations across steps at the cost of a longer compilation.
+            compute_dtype: optional reduced precision dtype for the operands of the matmuls inside the recurrence, for
+                example ``jn.bfloat16``. Products are then accumulated and the state is kept in float32, weights are
+                stored in float32. When ``None``, matmuls run in the dtype of the weights and state.
         """
         self.num_inputs = nin
         self.num_outputs = nout
         self.nstate = nstate
+        self.unroll = unroll
+        self.compute_dtype = compute_dtype
 
         # Update gate parameters
         self.w_xz = TrainVar(w_init((self.num_inputs, self.nstate)))
@@ -62,9 +72,15 @@ class GRU(Module):
         self.w_hq = TrainVar(w_init((self.nstate, self.num_outputs)))
         self.b_q = TrainVar(jn.zeros(self.num_outputs))
 
+        # Hidden state, resized by init_state
+        self.state = StateVar(jn.zeros((1, self.nstate)))
+
     def init_state(self, batch_size):
-        """Initialize hidden state for input batch of size ``batch_size``."""
-        self.state = StateVar(jn.zeros((batch_size, self.nstate)))
+        """Initialize hidden state for input batch of size ``batch_size``.
+
+        The state variable is updated in place so that modules built on top of this one, such as ``objax.Jit``, keep
+        tracking it."""
+        self.state.value = jn.zeros((batch_size, self.nstate))
 
     def __call__(self, inputs: JaxArray, only_return_final=False) -> JaxArray:
         """Forward pass through GRU.
@@ -77,17 +93,34 @@ class GRU(Module):
             Output tensor with dimensions ``num_steps * batch_size, vocabulary_size``.
         """
         # Dimensions: num_steps, batch_size, vocab_size
-        outputs = []
-        for x in inputs:
-            update_gate = sigmoid(jn.dot(x, self.w_xz.value) + jn.dot(self.state.value, self.w_hz.value) +
-                                  self.b_z. bnhvalue)
-            reset_gate = sigmoid(jn.dot(x, self.w_xr.value) + jn.dot(self.state.value, self.w_hr.value) +
-                                 self.b_r.value)
-            candidate_state = jn.tanh(jn.dot(x, self.w_xh.value) +
-                                      jn.dot(reset_gate * self.state.value, self.w_hh.value) + self.b_h.value)
-            self.state.value = update_gate * self.state.value + (1 - update_gate) * candidate_state
-            y = jn.dot(self.state.value, self.w_hq.value) + self.b_q.value
-            outputs.append(y)
+        # Input projections do not depend on the state: compute all three gates for the whole sequence in one matmul.
+        w_x = jn.concatenate((self.w_xz.value, self.w_xr.value, self.w_xh.value), axis=1)
+        b_x = jn.concatenate((self.b_z.value, self.b_r.value, self.b_h.value))
+        xz, xr, xh = jn.split(jn.dot(inputs, w_x) + b_x, 3, axis=-1)
+        # Update and reset gates share the same recurrent input, fuse them into a single matmul.
+        w_hzr = jn.concatenate((self.w_hz.value, self.w_hr.value), axis=1)
+        w_hh = self.w_hh.value
+        if self.compute_dtype is not None:
+            w_hzr, w_hh = w_hzr.astype(self.compute_dtype), w_hh.astype(self.compute_dtype)
+
+        def dot(x: JaxArray, w: JaxArray) -> JaxArray:
+            if self.compute_dtype is None:
+                return jn.dot(x, w)
+            return lax.dot(x.astype(self.compute_dtype), w, preferred_element_type=jn.float32)
+
+        def scan_op(state: JaxArray, x: Tuple[JaxArray, JaxArray, JaxArray]) -> Tuple[JaxArray, JaxArray]:
+            xz_t, xr_t, xh_t = x
+            hz, hr = jn.split(dot(state, w_hzr), 2, axis=-1)
+            update_gate = sigmoid(xz_t + hz)
+            reset_gate = sigmoid(xr_t + hr)
+            candidate_state = jn.tanh(xh_t + dot(reset_gate * state, w_hh))
+            next_state = update_gate * state + (1 - update_gate) * candidate_state
+            return next_state, next_state
+
+        # A single scan traces the step once, compile time does not grow with num_steps.
+        self.state.value, states = lax.scan(scan_op, self.state.value, (xz, xr, xh), unroll=self.unroll)
         if only_return_final:
-            return outputs[-1]
-        return jn.concatenate(outputs, axis=0)
+            return jn.dot(states[-1], self.w_hq.value) + self.b_q.value
+        # Output layer is applied to all the states at once rather than once per step.
+        outputs = jn.dot(states, self.w_hq.value) + self.b_q.value
+        return outputs.reshape((-1, self.num_outputs))
@@ -0,0 +1,88 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Callable, Tuple
+
+import jax.numpy as jn
+from jax import lax
+
+from objax import Module
+from objax.functional import sigmoid
+from objax.nn import Linear
+from objax.nn.init import kaiming_normal
+from objax.typing import JaxArray
+from objax.variable import StateVar
+
+
+class QRNN(Module):
+    """Quasi-Recurrent Neural Network (QRNN) block with fo-pooling from
+    `Quasi-Recurrent Neural Networks <https://arxiv.org/abs/1611.01576>`_.
+
+    All the matmuls only depend on the inputs and are computed for the whole sequence at once, the recurrence is
+    reduced to an elementwise pooling."""
+
+    def __init__(self,
+                 nstate: int,
+                 nin: int,
+                 nout: int,
+                 w_init: Callable = kaiming_normal,
+                 unroll: int = 1):
+        """Creates a QRNN instance.
+
+        Args:
+            nstate: number of hidden units.
+            nin: number of input units.
+            nout: number of output units.
+            w_init: weight initializer for QRNN model weights.
+            unroll: number of time steps unrolled in each iteration of the underlying loop.
+        """
+        self.num_inputs = nin
+        self.num_outputs = nout
+        self.nstate = nstate
+        self.unroll = unroll
+
+        # Candidate, forget gate and output gate projections
+        self.gates = Linear(self.num_inputs, 3 * self.nstate, w_init=w_init)
+        self.output_layer = Linear(self.nstate, self.num_outputs)
+
+        # Cell state, resized by init_state
+        self.state = StateVar(jn.zeros((1, self.nstate)))
+
+    def init_state(self, batch_size):
+        """Initialize cell state for input batch of size ``batch_size``."""
+        self.state.value = jn.zeros((batch_size, self.nstate))
+
+    def __call__(self, inputs: JaxArray, only_return_final=False) -> JaxArray:
+        """Forward pass through QRNN.
+
+        Args:
+            inputs: ``JaxArray`` with dimensions ``num_steps, batch_size, vocabulary_size``.
+            only_return_final: return only the last output if ``True``, or all output otherwise.
+
+        Returns:
+            Output tensor with dimensions ``num_steps * batch_size, vocabulary_size``.
+        """
+        # Dimensions: num_steps, batch_size, vocab_size
+        z, f, o = jn.split(self.gates(inputs), 3, axis=-1)
+        z, f, o = jn.tanh(z), sigmoid(f), sigmoid(o)
+
+        def scan_op(cell: JaxArray, x: Tuple[JaxArray, JaxArray]) -> Tuple[JaxArray, JaxArray]:
+            z_t, f_t = x
+            next_cell = f_t * cell + (1 - f_t) * z_t
+            return next_cell, next_cell
+
+        self.state.value, cells = lax.scan(scan_op, self.state.value, (z, f), unroll=self.unroll)
+        if only_return_final:
+            return self.output_layer(o[-1] * cells[-1])
+        return self.output_layer(o * cells).reshape((-1, self.num_outputs))
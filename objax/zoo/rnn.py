@@ -12,18 +12,135 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Callable
+from typing import Callable, Optional, Tuple, Union
 
 import jax.numpy as jn
+from jax import lax
 
-from objax import Module
+from objax import Module, ModuleList
 from objax.nn import Linear
 from objax.nn.init import kaiming_normal
 from objax.typing import JaxArray
 from objax.variable import TrainVar, StateVar
 
 
+def _quantize_int8(x: JaxArray, axis: int) -> Tuple[JaxArray, JaxArray]:
+    """Symmetric int8 quantization of x with one scale for each slice along axis, returns (int8 values, scale)."""
+    scale = jn.maximum(jn.abs(x).max(axis, keepdims=True), 1e-12) / 127
+    return jn.round(x / scale).astype(jn.int8), scale
+
+
 class RNN(Module):
+    """ Recurrent Neural Network (RNN) block."""
+
+    def __init__(self,
+                 nstate: int,
+                 nin: int,
+                 nout: int,
+                 activation: Callable = jn.tanh,
+                 w_init: Callable = kaiming_normal,
+                 unroll: int = 1,
+                 nlayers: int = 1,
+                 compute_dtype: Optional[jn.dtype] = None,
+                 quantize_whh: bool = False):
+        """Creates an RNN instance.
+
+        Args:
+            nstate: number of hidden units.
+            nin: number of input units.
+            nout: number of output units.
+            activation: activation function for the hidden layer.
+            w_init: weight initializer for RNN model weights.
+            unroll: number of time steps unrolled in each iteration of the underlying loop. Larger values let XLA
+                fuse operations across steps at the cost of a longer compilation.
+            nlayers: number of stacked recurrent layers, all layers are computed in the same loop over time.
+            compute_dtype: optional reduced precision dtype for the operands of the matmuls inside the recurrence, for
+                example ``jn.bfloat16``. Products are then accumulated and the state is kept in float32, weights are
+                stored in float32. When ``None``, matmuls run in the dtype of the weights and state.
+            quantize_whh: if ``True``, the recurrent matmuls use int8 operands with int32 accumulation: the recurrent
+                weights are quantized with one scale per hidden unit and the state with one scale per sample. The
+                quantization is not differentiable, this is meant for inference with trained weights.
+        """
+        self.num_inputs = nin
+        self.num_outputs = nout
+        self.nstate = nstate
+        self.nlayers = nlayers
+        self.unroll = unroll
+        self.compute_dtype = compute_dtype
+        self.quantize_whh = quantize_whh
+        self.activation = activation
+
+        # Hidden layer parameters
+        self.w_xh = TrainVar(w_init((self.num_inputs, self.nstate)))
+        self.w_hh = TrainVar(w_init((self.nstate, self.nstate)))
+        self.b_h = TrainVar(jn.zeros(self.nstate))
+
+        # Parameters of the layers stacked on top of the first one
+        self.w_xh_stack = ModuleList(TrainVar(w_init((self.nstate, self.nstate))) for _ in range(nlayers - 1))
+        self.w_hh_stack = ModuleList(TrainVar(w_init((self.nstate, self.nstate))) for _ in range(nlayers - 1))
+        self.b_h_stack = ModuleList(TrainVar(jn.zeros(self.nstate)) for _ in range(nlayers - 1))
+
+        self.output_layer = Linear(self.nstate, self.num_outputs)
+
+        # Hidden state of all layers concatenated on the last axis, resized by init_state
+        self.state = StateVar(jn.zeros((1, self.nlayers * self.nstate)))
+
     def init_state(self, batch_size):
-        """Initialize hidden state for input batch of size ``batch_size``."""
-        self.state = StateVar(jn.zeros((batch_size, self.nstate)))
+        """Initialize hidden state for input batch of size ``batch_size``.
+
+        The state variable is updated in place so that modules built on top of this one, such as ``objax.Jit``, keep
+        tracking it."""
+        self.state.value = jn.zeros((batch_size, self.nlayers * self.nstate))
+
+    def __call__(self, inputs: JaxArray, only_return_final=False) -> JaxArray:
+        """Forward pass through RNN.
+
+        Args:
+            inputs: ``JaxArray`` with dimensions ``num_steps, batch_size, vocabulary_size``.
+            only_return_final: return only the last output if ``True``, or all output otherwise.
+
+        Returns:
+            Output tensor with dimensions ``num_steps * batch_size, vocabulary_size``.
+        """
+        # Dimensions: num_steps, batch_size, vocab_size
+        # The whole batch is carried through the recurrence: each step is a single
+        # (batch_size, nstate) x (nstate, nstate) matmul instead of one matrix-vector product per sample.
+        xh = jn.dot(inputs, self.w_xh.value) + self.b_h.value
+
+        # Input weights and biases of the first layer are already applied in xh, only the upper layers are needed.
+        # The recurrent weights are needed for all the layers, w_hh[0] is the first layer.
+        w_xh_upper = [w.value for w in self.w_xh_stack]
+        b_h_upper = [b.value for b in self.b_h_stack]
+        w_hh = [w.value for w in [self.w_hh] + list(self.w_hh_stack)]
+        if self.compute_dtype is not None:
+            w_xh_upper = [w.astype(self.compute_dtype) for w in w_xh_upper]
+        if self.quantize_whh:
+            w_hh = [_quantize_int8(w, axis=0) for w in w_hh]
+        elif self.compute_dtype is not None:
+            w_hh = [w.astype(self.compute_dtype) for w in w_hh]
+
+        def dot(x: JaxArray, w: JaxArray) -> JaxArray:
+            if self.compute_dtype is None:
+                return jn.dot(x, w)
+            return lax.dot(x.astype(self.compute_dtype), w, preferred_element_type=jn.float32)
+
+        def dot_hh(x: JaxArray, w: Union[JaxArray, Tuple[JaxArray, JaxArray]]) -> JaxArray:
+            if not self.quantize_whh:
+                return dot(x, w)
+            (w_int8, w_scale), (x_int8, x_scale) = w, _quantize_int8(x, axis=-1)
+            return lax.dot(x_int8, w_int8, preferred_element_type=jn.int32) * (x_scale * w_scale)
+
+        def scan_op(state: Tuple[JaxArray, ...], x: JaxArray) -> Tuple[Tuple[JaxArray, ...], JaxArray]:
+            next_state = [self.activation(x + dot_hh(state[0], w_hh[0]))]
+            # Upper layers consume the current step of the layer below, the sequence of intermediate
+            # states is never materialized.
+            for wx, wh, b, layer_state in zip(w_xh_upper, w_hh[1:], b_h_upper, state[1:]):
+                next_state.append(self.activation(dot(next_state[-1], wx) + dot_hh(layer_state, wh) + b))
+            return tuple(next_state), next_state[-1]
+
+        state = tuple(jn.split(self.state.value, self.nlayers, axis=-1))
+        state, states = lax.scan(scan_op, state, xh, unroll=self.unroll)
+        self.state.value = jn.concatenate(state, axis=-1)
+        if only_return_final:
+            return self.output_layer(states[-1])
+        return self.output_layer(states).reshape((-1, self.num_outputs))
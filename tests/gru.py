@@ -0,0 +1,113 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unittests for GRU."""
+
+import unittest
+
+import jax.numpy as jn
+import numpy as np
+
+import objax
+from objax.zoo.gru import GRU
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def gru_reference(model, inputs):
+    """Step by step numpy implementation of the GRU forward pass."""
+    v = {k.split('.')[-1]: np.asarray(t) for k, t in model.vars().items()}
+    state = v['state']
+    outputs = []
+    for x in np.asarray(inputs):
+        update_gate = sigmoid(x.dot(v['w_xz']) + state.dot(v['w_hz']) + v['b_z'])
+        reset_gate = sigmoid(x.dot(v['w_xr']) + state.dot(v['w_hr']) + v['b_r'])
+        candidate_state = np.tanh(x.dot(v['w_xh']) + (reset_gate * state).dot(v['w_hh']) + v['b_h'])
+        state = update_gate * state + (1 - update_gate) * candidate_state
+        outputs.append(state.dot(v['w_hq']) + v['b_q'])
+    return np.concatenate(outputs, axis=0), state
+
+
+class TestGRU(unittest.TestCase):
+    def test_gru(self):
+        """Compare the GRU output and final state with a step by step implementation."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = GRU(nstate, nin, nout)
+        # Biases are initialized to zero, randomize them so that the bias terms are checked too.
+        for b in (model.b_z, model.b_r, model.b_h, model.b_q):
+            b.assign(objax.random.normal(b.value.shape))
+        model.init_state(batch_size)
+        model.state.value = objax.random.normal((batch_size, nstate))
+        x = objax.random.normal((num_steps, batch_size, nin))
+        expected_y, expected_state = gru_reference(model, x)
+        y = model(x)
+        self.assertEqual(y.shape, (num_steps * batch_size, nout))
+        self.assertTrue(np.allclose(y, expected_y, atol=1e-5))
+        self.assertTrue(np.allclose(model.state.value, expected_state, atol=1e-5))
+
+    def test_gru_only_return_final(self):
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = GRU(nstate, nin, nout)
+        model.init_state(batch_size)
+        x = objax.random.normal((num_steps, batch_size, nin))
+        expected_y, _ = gru_reference(model, x)
+        y = model(x, only_return_final=True)
+        self.assertEqual(y.shape, (batch_size, nout))
+        self.assertTrue(np.allclose(y, expected_y[-batch_size:], atol=1e-5))
+
+    def test_gru_unroll(self):
+        """Unrolling the loop does not change the result, even when it does not divide num_steps."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = GRU(nstate, nin, nout)
+        model_unrolled = GRU(nstate, nin, nout, unroll=3)
+        model_unrolled.vars().assign(model.vars().tensors())
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        model_unrolled.init_state(batch_size)
+        self.assertTrue(np.allclose(model(x), model_unrolled(x), atol=1e-5))
+        self.assertTrue(np.allclose(model.state.value, model_unrolled.state.value, atol=1e-5))
+
+    def test_gru_jit(self):
+        """The jitted GRU matches the eager one, including when the state is initialized after jitting."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = GRU(nstate, nin, nout)
+        jit_model = objax.Jit(model)
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        y = model(x)
+        state = model.state.value
+        model.init_state(batch_size)
+        self.assertTrue(np.allclose(jit_model(x), y, atol=1e-5))
+        self.assertTrue(np.allclose(model.state.value, state, atol=1e-5))
+
+    def test_gru_bfloat16(self):
+        """Recurrent matmuls in bfloat16 stay close to the float32 result."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = GRU(nstate, nin, nout)
+        model_bf16 = GRU(nstate, nin, nout, compute_dtype=jn.bfloat16)
+        model_bf16.vars().assign(model.vars().tensors())
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        model_bf16.init_state(batch_size)
+        y_bf16 = model_bf16(x)
+        self.assertEqual(y_bf16.dtype, jn.float32)
+        self.assertEqual(model_bf16.state.value.dtype, jn.float32)
+        self.assertTrue(np.allclose(model(x), y_bf16, atol=5e-2))
+        self.assertTrue(np.allclose(model.state.value, model_bf16.state.value, atol=5e-2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,7 +15,9 @@
 """Unittests for ObJAX JIT."""
 
 import unittest
+import unittest.mock
 
+import jax
 import jax.numpy as jn
 from jax.core import ConcretizationTypeError
 
@@ -80,6 +82,17 @@ class TestJit(unittest.TestCase):
         with self.assertRaises(ConcretizationTypeError):
             kj(x, training=True)
 
+    def test_jit_donate_argnums(self):
+        k = objax.nn.Linear(3, 3)
+        x = objax.random.normal((64, 3))
+        y1 = objax.Jit(k)(x)
+        with unittest.mock.patch('jax.jit', wraps=jax.jit) as jax_jit:
+            kj = objax.Jit(k, donate_argnums=(0,))
+        # The arguments of f come after the variable tensors and the kwargs in the jitted function.
+        self.assertEqual(jax_jit.call_args[1]['donate_argnums'], (2,))
+        y2 = kj(x + 0)
+        self.assertEqual(y1.tolist(), y2.tolist())
+
     def test_trainvar_assign(self):
         m = objax.ModuleList([objax.TrainVar(jn.zeros(2))])
 
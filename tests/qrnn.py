@@ -0,0 +1,64 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unittests for QRNN."""
+
+import unittest
+
+import numpy as np
+
+import objax
+from objax.zoo.qrnn import QRNN
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class TestQRNN(unittest.TestCase):
+    def test_qrnn(self):
+        """Compare the QRNN output and final state with a step by step implementation."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = QRNN(nstate, nin, nout)
+        model.init_state(batch_size)
+        model.state.value = objax.random.normal((batch_size, nstate))
+        x = objax.random.normal((num_steps, batch_size, nin))
+        w, b = np.asarray(model.gates.w.value), np.asarray(model.gates.b.value)
+        w_out, b_out = np.asarray(model.output_layer.w.value), np.asarray(model.output_layer.b.value)
+        cell = np.asarray(model.state.value)
+        expected_y = []
+        for x_t in np.asarray(x):
+            z, f, o = np.split(x_t.dot(w) + b, 3, axis=-1)
+            cell = sigmoid(f) * cell + (1 - sigmoid(f)) * np.tanh(z)
+            expected_y.append((sigmoid(o) * cell).dot(w_out) + b_out)
+        expected_y = np.concatenate(expected_y)
+        y = model(x)
+        self.assertEqual(y.shape, (num_steps * batch_size, nout))
+        self.assertTrue(np.allclose(y, expected_y, atol=1e-5))
+        self.assertTrue(np.allclose(model.state.value, cell, atol=1e-5))
+
+    def test_qrnn_only_return_final(self):
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = QRNN(nstate, nin, nout)
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        y = model(x)
+        model.init_state(batch_size)
+        y_final = model(x, only_return_final=True)
+        self.assertEqual(y_final.shape, (batch_size, nout))
+        self.assertTrue(np.allclose(y_final, y[-batch_size:], atol=1e-5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unittests for RNN."""
+
+import unittest
+
+import jax.numpy as jn
+import numpy as np
+
+import objax
+from objax.zoo.rnn import RNN
+
+
+def rnn_reference(model, inputs):
+    """Step by step numpy implementation of the RNN forward pass."""
+    v = {k.split('.')[-1]: np.asarray(t) for k, t in model.vars().items()}
+    state = v['state']
+    outputs = []
+    for x in np.asarray(inputs):
+        state = np.tanh(x.dot(v['w_xh']) + state.dot(v['w_hh']) + v['b_h'])
+        outputs.append(state.dot(v['w']) + v['b'])
+    return np.concatenate(outputs, axis=0), state
+
+
+class TestRNN(unittest.TestCase):
+    def test_rnn(self):
+        """Compare the RNN output and final state with a step by step implementation."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = RNN(nstate, nin, nout)
+        model.init_state(batch_size)
+        model.state.value = objax.random.normal((batch_size, nstate))
+        x = objax.random.normal((num_steps, batch_size, nin))
+        expected_y, expected_state = rnn_reference(model, x)
+        y = model(x)
+        self.assertEqual(y.shape, (num_steps * batch_size, nout))
+        self.assertTrue(np.allclose(y, expected_y, atol=1e-5))
+        self.assertTrue(np.allclose(model.state.value, expected_state, atol=1e-5))
+
+    def test_rnn_batch_independence(self):
+        """Each sequence of the batch is processed independently of the others."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = RNN(nstate, nin, nout)
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        y = model(x).reshape((num_steps, batch_size, nout))
+        for i in range(batch_size):
+            model.init_state(1)
+            y_i = model(x[:, i:i + 1])
+            self.assertTrue(np.allclose(y[:, i], y_i, atol=1e-5))
+
+    def test_rnn_only_return_final(self):
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = RNN(nstate, nin, nout)
+        model.init_state(batch_size)
+        x = objax.random.normal((num_steps, batch_size, nin))
+        expected_y, _ = rnn_reference(model, x)
+        y = model(x, only_return_final=True)
+        self.assertEqual(y.shape, (batch_size, nout))
+        self.assertTrue(np.allclose(y, expected_y[-batch_size:], atol=1e-5))
+
+    def test_rnn_unroll(self):
+        """Unrolling the loop does not change the result, even when it does not divide num_steps."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = RNN(nstate, nin, nout)
+        model_unrolled = RNN(nstate, nin, nout, unroll=3)
+        model_unrolled.vars().assign(model.vars().tensors())
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        model_unrolled.init_state(batch_size)
+        self.assertTrue(np.allclose(model(x), model_unrolled(x), atol=1e-5))
+        self.assertTrue(np.allclose(model.state.value, model_unrolled.state.value, atol=1e-5))
+
+    def test_rnn_jit(self):
+        """The jitted RNN matches the eager one, including when the state is initialized after jitting."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = RNN(nstate, nin, nout)
+        jit_model = objax.Jit(model)
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        y = model(x)
+        state = model.state.value
+        model.init_state(batch_size)
+        self.assertTrue(np.allclose(jit_model(x), y, atol=1e-5))
+        self.assertTrue(np.allclose(model.state.value, state, atol=1e-5))
+
+    def test_rnn_stacked(self):
+        """Compare a stacked RNN with a step by step implementation."""
+        num_steps, batch_size, nin, nstate, nout, nlayers = 7, 3, 4, 5, 2, 3
+        model = RNN(nstate, nin, nout, nlayers=nlayers)
+        model.init_state(batch_size)
+        self.assertEqual(model.state.value.shape, (batch_size, nlayers * nstate))
+        model.state.value = objax.random.normal((batch_size, nlayers * nstate))
+        x = objax.random.normal((num_steps, batch_size, nin))
+        w_xh = [np.asarray(v.value) for v in [model.w_xh] + list(model.w_xh_stack)]
+        w_hh = [np.asarray(v.value) for v in [model.w_hh] + list(model.w_hh_stack)]
+        b_h = [np.asarray(v.value) for v in [model.b_h] + list(model.b_h_stack)]
+        state = np.split(np.asarray(model.state.value), nlayers, axis=-1)
+        expected_y = []
+        for x_t in np.asarray(x):
+            for layer in range(nlayers):
+                x_t = state[layer] = np.tanh(x_t.dot(w_xh[layer]) + state[layer].dot(w_hh[layer]) + b_h[layer])
+            expected_y.append(x_t.dot(model.output_layer.w.value) + model.output_layer.b.value)
+        y = model(x)
+        self.assertEqual(y.shape, (num_steps * batch_size, nout))
+        self.assertTrue(np.allclose(y, np.concatenate(expected_y), atol=1e-5))
+        self.assertTrue(np.allclose(model.state.value, np.concatenate(state, axis=-1), atol=1e-5))
+
+    def test_rnn_bfloat16(self):
+        """Recurrent matmuls in bfloat16 stay close to the float32 result."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = RNN(nstate, nin, nout)
+        model_bf16 = RNN(nstate, nin, nout, compute_dtype=jn.bfloat16)
+        model_bf16.vars().assign(model.vars().tensors())
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        model_bf16.init_state(batch_size)
+        y_bf16 = model_bf16(x)
+        self.assertEqual(y_bf16.dtype, jn.float32)
+        self.assertEqual(model_bf16.state.value.dtype, jn.float32)
+        self.assertTrue(np.allclose(model(x), y_bf16, atol=5e-2))
+
+    def test_rnn_quantize_whh(self):
+        """Int8 recurrent matmuls stay close to the float32 result."""
+        num_steps, batch_size, nin, nstate, nout, nlayers = 7, 3, 4, 5, 2, 2
+        model = RNN(nstate, nin, nout, nlayers=nlayers)
+        model_int8 = RNN(nstate, nin, nout, nlayers=nlayers, quantize_whh=True)
+        model_int8.vars().assign(model.vars().tensors())
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        model_int8.init_state(batch_size)
+        self.assertTrue(np.allclose(model(x), model_int8(x), atol=5e-2))
+        self.assertTrue(np.allclose(model.state.value, model_int8.state.value, atol=5e-2))
+
+    def test_rnn_jit_static_only_return_final(self):
+        """only_return_final is a Python bool, it is passed as a static argument to specialize the compiled graph."""
+        num_steps, batch_size, nin, nstate, nout = 7, 3, 4, 5, 2
+        model = RNN(nstate, nin, nout)
+        jit_model = objax.Jit(model, static_argnums=(1,))
+        x = objax.random.normal((num_steps, batch_size, nin))
+        model.init_state(batch_size)
+        y = model(x)
+        model.init_state(batch_size)
+        y_final = jit_model(x, True)
+        self.assertEqual(y_final.shape, (batch_size, nout))
+        self.assertTrue(np.allclose(y_final, y[-batch_size:], atol=1e-5))
+
+
+if __name__ == '__main__':
+    unittest.main()